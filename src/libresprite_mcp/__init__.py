@@ -19,11 +19,10 @@ def main() -> None:
     click.echo = echo
     click.secho = secho
 
-    # Initialize and start HTTP relay server
+    # Initialize HTTP relay server
     libresprite_proxy = LibrespriteProxy(port=64823)
-    libresprite_proxy.start()
 
-    # Initialize and run MCP server (this blocks)
+    # Initialize and run MCP server, which starts and stops the relay server (this blocks)
     mcp_server = MCPServer(libresprite_proxy)
     mcp_server.run(transport='stdio')
 
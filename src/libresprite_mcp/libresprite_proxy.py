@@ -2,10 +2,12 @@
 Proxy server for Libresprite.
 """
 
+import asyncio
 import threading
 from typing import Optional
 from mcp.server.fastmcp import Context
 from flask import Flask, jsonify, request
+from werkzeug.serving import BaseWSGIServer, make_server
 
 class LibrespriteProxy:
     """
@@ -19,15 +21,17 @@ class LibrespriteProxy:
         # Stores current script
         self._script: str | None = None
 
-        # Stores output of the script execution
-        self._output: str | None = None
+        # Stores pending output of the script execution, resolved by the relay server
+        self._output: asyncio.Future[str] | None = None
 
         # Stores flag indicating if execution is in progress
         self._lock: bool = False
 
         # Initialize event handlers
         self._script_event = threading.Event()
-        self._output_event = threading.Event()
+
+        # Guards handing the current script over to the relay server
+        self._script_lock = threading.Lock()
 
         # Relay server configuration
         self.port = port
@@ -35,6 +39,7 @@ class LibrespriteProxy:
 
         # Initialize server routes
         self._setup_routes()
+        self._server: Optional[BaseWSGIServer] = None
         self._server_thread: Optional[threading.Thread] = None
 
     def _setup_routes(self):
@@ -43,17 +48,21 @@ class LibrespriteProxy:
         @self.app.get('/')
         def get_script():
             """Get the current script."""
-            if self._script is None:
+            # Every fetched script is followed by a posted output, so never hand out a script that was withdrawn
+            script = None
+            while script is None:
                 self._script_event.wait()
-                self._script_event.clear()
-            script = self._script
-            self._script = None
+                with self._script_lock:
+                    script = self._script
+                    self._script = None
+                    self._script_event.clear()
             return jsonify({"script": script})
 
         @self.app.post('/')
         def post_output():
             """Post execution output."""
-            if not self._lock:
+            future = self._output
+            if not self._lock or future is None:
                 # ignore random requests
                 return jsonify({"status": "ignored"})
             req = request.get_json(force=True, silent=True)
@@ -61,8 +70,8 @@ class LibrespriteProxy:
                 output = req.get('output')
             else:
                 return jsonify({"status": "invalid"})
-            self._output = output
-            self._output_event.set()
+            # Hand the output over to the event loop awaiting it
+            future.get_loop().call_soon_threadsafe(self._set_output, future, output)
             return jsonify({"status": "success"})
 
         @self.app.get('/ping')
@@ -70,55 +79,85 @@ class LibrespriteProxy:
             """Ping endpoint for health checks."""
             return jsonify({"status": "pong"})
 
-    def _run_server(self):
-        """Run the Flask server."""
-        self.app.run(
-            host='localhost',
-            port=self.port,
-            debug=False,
-            use_reloader=False
-        )
-
     def start(self):
         """Start the HTTP server in a background thread."""
         if self._server_thread and self._server_thread.is_alive():
             return
 
+        self._server = make_server(
+            host='localhost',
+            port=self.port,
+            app=self.app,
+            threaded=True
+        )
         self._server_thread = threading.Thread(
-            target=self._run_server,
+            target=self._server.serve_forever,
             daemon=True
         )
         self._server_thread.start()
 
-    def run_script(self, script: str, ctx: Context) -> str:
+    def stop(self):
+        """Stop the HTTP server and wait for its thread to exit."""
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+        if self._server_thread is not None:
+            self._server_thread.join()
+            self._server_thread = None
+
+    def _release(self):
+        """Release the execution lock."""
+        self._output = None
+        self._lock = False
+
+    @staticmethod
+    def _set_output(future: asyncio.Future[str], output: str):
+        """Resolve a pending script execution with its output."""
+        if not future.done():
+            future.set_result(output)
+
+    async def run_script(self, script: str, ctx: Context) -> str:
         """
         Run a script in the execution context.
 
-        WARNING: This method is synchronous and blocking.
-
         Args:
             script: The script to execute
         """
         # This proxy only allows one script to be executed at a time
         if self._lock:
-            ctx.error("Script execution is already in progress...")
+            await ctx.error("Script execution is already in progress...")
             raise RuntimeError("Script execution is already in progress.")
-
-        # Sending the script
-        ctx.info("Sending script to libresprite...")
         self._lock = True
-        self._script = script
-        self._script_event.set()
-
-        # Waiting for execution
-        if not self._output_event.wait(timeout=15):
-            ctx.warning("This is taking longer than usual, make sure the user has the Libresprite application with the remote script running?")
-        self._output_event.wait()
-        self._output_event.clear()
-
-        # Return the output
-        ctx.info("Script execution completed, checking the logs...")
-        output = self._output
-        self._output = None
-        self._lock = False
-        return output
\ No newline at end of file
+
+        try:
+            # Sending the script
+            await ctx.info("Sending script to libresprite...")
+            self._output = asyncio.get_running_loop().create_future()
+            with self._script_lock:
+                self._script = script
+                self._script_event.set()
+
+            # Waiting for execution
+            try:
+                output = await asyncio.wait_for(asyncio.shield(self._output), timeout=15)
+            except TimeoutError:
+                await ctx.warning("This is taking longer than usual, make sure the user has the Libresprite application with the remote script running?")
+                output = await asyncio.shield(self._output)
+
+            # Return the output
+            await ctx.info("Script execution completed, checking the logs...")
+            return output
+        finally:
+            # Withdraw the script if libresprite has not fetched it yet
+            with self._script_lock:
+                fetched = self._script is None
+                self._script = None
+                self._script_event.clear()
+            output_future = self._output
+            if fetched and output_future is not None and not output_future.done():
+                # The call was cancelled while libresprite runs the script, hold the lock until its output
+                # arrives so that it is not mistaken for the output of the next script
+                output_future.add_done_callback(lambda _: self._release())
+            else:
+                self._release()
@@ -2,14 +2,41 @@
 MCP server implementation that exposes tools for interacting with the libresprite-proxy server.
 """
 
-import os
+import asyncio
+from importlib.resources import files
 from mcp.server.fastmcp import FastMCP, Context
 from .libresprite_proxy import LibrespriteProxy
 
 
+def _read_resource(name: str) -> str:
+    """Read a bundled resource file, or describe why it could not be read."""
+    try:
+        return (files(__package__) / "resources" / name).read_text(encoding="utf-8")
+    except Exception as e:
+        return f"Error reading {name}: {e}"
+
+# The docs ship with the package and never change, so read them once at import
+_REFERENCE = _read_resource("reference.txt")
+_EXAMPLES = _read_resource("examples.txt")
+
+# Static part of the `libresprite` prompt, the user prompt is appended to it
+_LIBRESPRITE_PROMPT_PREFIX = """
+Libresprite is a program for creating and editing pixel art and animations using JavaScript.
+
+Before proceeding, please ensure you are well versed with the documentation and examples provided in the resources `docs:reference` and `docs:examples`.
+
+You can use the `run_script` tool to execute JavaScript scripts in the context of libresprite.
+
+Here's what you need to do using the above tools and resources:
+
+"""
+
+
 class MCPServer:
     """The LibreSprite MCP Server."""
 
+    __slots__ = ("_libresprite_proxy", "mcp")
+
     def __init__(self, libresprite_proxy: LibrespriteProxy, server_name: str = "libresprite"):
         # Cache the libresprite proxy instance
         self._libresprite_proxy = libresprite_proxy
@@ -26,7 +53,7 @@ class MCPServer:
         """Setup MCP tools."""
 
         @self.mcp.tool()
-        def run_script(script: str, ctx: Context) -> str:
+        async def run_script(script: str, ctx: Context) -> str:
             """
             Run a JavaScript script inside Libresprite.
 
@@ -38,32 +65,20 @@ class MCPServer:
             Returns:
                 Console output
             """
-            return self._libresprite_proxy.run_script(script, ctx)
+            return await self._libresprite_proxy.run_script(script, ctx)
 
     def _setup_resources(self):
         """Setup MCP resources."""
 
-        base_dir = os.path.dirname(os.path.abspath(__file__))
-
         @self.mcp.resource("docs://reference")
         def read_reference() -> str:
             """Read the libresprite command reference documentation."""
-            doc_path = os.path.join(base_dir, "resources", "reference.txt")
-            try:
-                with open(doc_path, "r", encoding="utf-8") as f:
-                    return f.read()
-            except Exception as e:
-                return f"Error reading reference.txt: {e}"
+            return _REFERENCE
 
         @self.mcp.resource("docs://examples")
         def read_examples() -> str:
             """Read example scripts using libresprite commands."""
-            example_path = os.path.join(base_dir, "resources", "examples.txt")
-            try:
-                with open(example_path, "r", encoding="utf-8") as f:
-                    return f.read()
-            except Exception as e:
-                return f"Error reading examples.txt: {e}"
+            return _EXAMPLES
 
     def _setup_prompts(self):
         """Setup MCP prompts."""
@@ -79,18 +94,29 @@ class MCPServer:
             Returns:
                 Prompt to process
             """
-            return f"""
-            Libresprite is a program for creating and editing pixel art and animations using JavaScript.
-
-            Before proceeding, please ensure you are well versed with the documentation and examples provided in the resources `docs:reference` and `docs:examples`.
-
-            You can use the `run_script` tool to execute JavaScript scripts in the context of libresprite.
-
-            Here's what you need to do using the above tools and resources:
-
-            {prompt}
-            """
+            return _LIBRESPRITE_PROMPT_PREFIX + prompt
+
+    async def __aenter__(self):
+        """Start the libresprite proxy."""
+        self._libresprite_proxy.start()
+        return self
+
+    async def __aexit__(self, *exc):
+        """Stop the libresprite proxy."""
+        await asyncio.to_thread(self._libresprite_proxy.stop)
+
+    async def run_async(self, transport: str = 'stdio'):
+        """Run the MCP server, stopping the libresprite proxy on exit."""
+        runners = {
+            'stdio': self.mcp.run_stdio_async,
+            'sse': self.mcp.run_sse_async,
+            'streamable-http': self.mcp.run_streamable_http_async,
+        }
+        if transport not in runners:
+            raise ValueError(f"Unknown transport: {transport}")
+        async with self:
+            await runners[transport]()
 
     def run(self, transport: str = 'stdio'):
         """Run the MCP server."""
-        self.mcp.run(transport=transport)
\ No newline at end of file
+        asyncio.run(self.run_async(transport=transport))